@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the Care Plan PDF Generator.
+
+Runs the generator against a local PostgREST-compatible stand-in that serves
+synthetic care plans, so fetch time, layout time, pages, peak RSS and batch
+throughput can be measured without touching the live Supabase project.
+
+Usage:
+    python care_plan_pdf_benchmark.py [--plans N] [--medications 1,200]
+        [--findings-chars 200,4000] [--latency-ms MS] [--workers 1,4] [--json PATH]
+
+Dependencies:
+    pip install reportlab requests --break-system-packages
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlparse, parse_qsl, unquote
+
+import care_plan_pdf_generator as generator
+
+# Embeddable relationships: (parent table, embedded table) -> (parent column,
+# embedded column, to-many?)
+RELATIONSHIPS = {
+    ('rc_cases', 'rc_clients'): ('client_id', 'id', False),
+    ('rc_care_plans', 'rc_cases'): ('case_id', 'id', False),
+    ('rc_medication_reconciliations', 'rc_medication_items'): ('id', 'med_rec_id', True),
+    **{
+        ('rc_care_plans', table): ('id', 'care_plan_id', True)
+        for table in (
+            'rc_fourps_assessments', 'rc_sdoh_assessments', 'rc_overlay_selections',
+            'rc_guideline_references', 'rc_care_plan_vs', 'rc_care_plan_attestations',
+            'rc_medication_reconciliations',
+        )
+    },
+}
+
+CARE_PLAN_TYPES = list(generator.CARE_PLAN_TYPE_LABELS)
+OVERLAY_TYPES = ['chronic_pain', 'traumatic_brain_injury', 'spinal_cord', 'behavioral_health']
+GUIDELINE_TYPES = ['odg', 'mtus', 'acoem', 'internal']
+LOREM = (
+    "Client reports intermittent lumbar pain radiating to the left leg, worse after "
+    "prolonged sitting. Sleep disrupted two to three nights per week. Adherent to home "
+    "exercise program with moderate improvement in range of motion. "
+)
+
+
+def _text(rng: random.Random, chars: int) -> str:
+    """Synthetic free text of roughly chars characters."""
+    if chars <= 0:
+        return ''
+    start = rng.randrange(len(LOREM))
+    repeated = (LOREM * (chars // len(LOREM) + 2))[start:start + chars]
+    return repeated.strip()
+
+
+def build_dataset(plans: int = 20, medications: int = 10, findings_chars: int = 400,
+                  overlays: int = 3, guidelines: int = 4, plans_per_case: int = 3,
+                  seed: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+    """Build synthetic rows for every table the generator reads."""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    db: Dict[str, List[Dict[str, Any]]] = {table: [] for table in (
+        'rc_clients', 'rc_cases', 'rc_care_plans', 'rc_fourps_assessments',
+        'rc_sdoh_assessments', 'rc_overlay_selections', 'rc_guideline_references',
+        'rc_care_plan_vs', 'rc_care_plan_attestations', 'rc_medication_reconciliations',
+        'rc_medication_items',
+    )}
+
+    def ts(days: float) -> str:
+        return (base + timedelta(days=days)).isoformat()
+
+    for n in range(plans):
+        case_n = n // plans_per_case
+        case_id = f"case-{case_n:06d}"
+        if n % plans_per_case == 0:
+            client_id = f"client-{case_n:06d}"
+            db['rc_clients'].append({
+                'id': client_id, 'first_name': f"Client{case_n}", 'last_name': 'Synthetic',
+                'created_at': ts(0),
+            })
+            db['rc_cases'].append({
+                'id': case_id, 'client_id': client_id, 'case_number': f"RC-{case_n:06d}",
+                'date_of_injury': ts(-30)[:10], 'injury_type': 'Motor Vehicle Accident',
+                'created_at': ts(0),
+            })
+
+        plan_id = f"plan-{n:06d}"
+        created = n % plans_per_case * 60
+        db['rc_care_plans'].append({
+            'id': plan_id, 'case_id': case_id, 'plan_number': n % plans_per_case + 1,
+            'care_plan_type': CARE_PLAN_TYPES[n % len(CARE_PLAN_TYPES)],
+            'status': 'submitted', 'created_at': ts(created), 'updated_at': ts(created + 1),
+            'pdf_url': None, 'pdf_generated_at': None,
+        })
+        db['rc_fourps_assessments'].append({
+            'id': f"fourps-{n:06d}", 'care_plan_id': plan_id, 'created_at': ts(created),
+            'p1_physical': rng.randint(1, 5), 'p2_psychological': rng.randint(1, 5),
+            'p3_psychosocial': rng.randint(1, 5), 'p4_professional': rng.randint(1, 5),
+            'p1_notes': _text(rng, 200), 'p2_notes': _text(rng, 120),
+            'p3_notes': None, 'p4_notes': _text(rng, 80),
+        })
+        db['rc_sdoh_assessments'].append({
+            'id': f"sdoh-{n:06d}", 'care_plan_id': plan_id, 'created_at': ts(created),
+            'economic_score': rng.randint(1, 5), 'education_score': rng.randint(1, 5),
+            'healthcare_score': rng.randint(1, 5), 'neighborhood_score': rng.randint(1, 5),
+            'social_score': rng.randint(1, 5),
+            'housing_insecurity': rng.random() < 0.2, 'food_insecurity': rng.random() < 0.15,
+            'transportation_barrier': rng.random() < 0.3, 'financial_hardship': rng.random() < 0.4,
+            'social_isolation': rng.random() < 0.25,
+        })
+        for i in range(overlays):
+            db['rc_overlay_selections'].append({
+                'id': f"overlay-{n:06d}-{i}", 'care_plan_id': plan_id, 'created_at': ts(created),
+                'overlay_type': OVERLAY_TYPES[i % len(OVERLAY_TYPES)], 'overlay_subtype': 'moderate',
+                'application_notes': _text(rng, 150),
+            })
+        for i in range(guidelines):
+            db['rc_guideline_references'].append({
+                'id': f"guideline-{n:06d}-{i}", 'care_plan_id': plan_id, 'created_at': ts(created),
+                'guideline_type': GUIDELINE_TYPES[i % len(GUIDELINE_TYPES)],
+                'guideline_name': f"Guideline {i + 1}", 'recommendation': _text(rng, 250),
+                'deviation_reason': _text(rng, 80) if i % 3 == 0 else None,
+                'deviation_justification': _text(rng, 120) if i % 3 == 0 else None,
+            })
+        for v in range(1, 11):
+            db['rc_care_plan_vs'].append({
+                'id': f"v-{n:06d}-{v}", 'care_plan_id': plan_id, 'v_number': v,
+                'created_at': ts(created), 'status': 'completed' if v < 9 else 'pending',
+                'findings': _text(rng, findings_chars), 'recommendations': _text(rng, findings_chars // 2),
+            })
+        db['rc_care_plan_attestations'].append({
+            'id': f"attestation-{n:06d}", 'care_plan_id': plan_id, 'created_at': ts(created + 1),
+            'attested_at': ts(created + 1), 'skipped_sections': ['v9', 'v10'],
+            'skipped_justification': 'Not applicable before discharge.',
+        })
+        med_rec_id = f"medrec-{n:06d}"
+        db['rc_medication_reconciliations'].append({
+            'id': med_rec_id, 'care_plan_id': plan_id, 'status': 'submitted', 'created_at': ts(created),
+        })
+        for i in range(medications):
+            db['rc_medication_items'].append({
+                'id': f"med-{n:06d}-{i:04d}", 'med_rec_id': med_rec_id, 'still_taking': True,
+                'created_at': ts(created), 'medication_name': f"Medication {i + 1}",
+                'dosage': f"{rng.choice([5, 10, 20, 50])} mg", 'frequency': 'Twice daily',
+                'prescriber': f"Dr. Prescriber {i % 7}",
+            })
+    return db
+
+
+def _parse_select(select: str) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Split a PostgREST select into plain columns and embedded (table, select) pairs."""
+    columns, embeds, depth, token = [], [], 0, ''
+    for char in select + ',':
+        if char == ',' and depth == 0:
+            match = re.match(r'^([\w]+)\((.*)\)$', token)
+            if match:
+                embeds.append((match.group(1), match.group(2)))
+            elif token:
+                columns.append(token)
+            token = ''
+            continue
+        depth += char == '('
+        depth -= char == ')'
+        token += char
+    return columns, embeds
+
+
+def _coerce(value: str) -> Any:
+    return {'true': True, 'false': False, 'null': None}.get(value, value)
+
+
+def _matches(row: Dict[str, Any], column: str, expression: str) -> bool:
+    """Evaluate one PostgREST filter (eq, neq, gt, gte, lt, lte, in, is, or)."""
+    if column == 'or':
+        # Terms are column.op.value; values with reserved characters are double-quoted
+        terms = re.findall(r'([^,.()]+)\.([a-z]+)\.("[^"]*"|[^,()]*)', expression)
+        if any(not value.startswith('"') and re.search(r'[.:]', value) for _, _, value in terms):
+            raise ValueError(f"reserved character in unquoted or=() value: {expression}")
+        return any(_matches(row, term_column, f"{op}.{value.strip(chr(34))}")
+                   for term_column, op, value in terms)
+    op, _, value = expression.partition('.')
+    actual = row.get(column)
+    if op == 'in':
+        return str(actual) in value.strip('()').split(',')
+    if op == 'is':
+        return actual is _coerce(value)
+    expected = _coerce(value)
+    if op in ('eq', 'neq'):
+        equal = actual == expected or (not isinstance(actual, bool) and str(actual) == value)
+        return equal if op == 'eq' else not equal
+    if actual is None:
+        return False
+    if isinstance(actual, (int, float)) and not isinstance(actual, bool):
+        actual, expected = float(actual), float(value)
+    else:
+        actual, expected = str(actual), value
+        actual_ts, expected_ts = generator.parse_timestamp(actual), generator.parse_timestamp(value)
+        if actual_ts and expected_ts:
+            actual, expected = actual_ts, expected_ts
+    return {'gt': actual > expected, 'gte': actual >= expected,
+            'lt': actual < expected, 'lte': actual <= expected}.get(op, True)
+
+
+def _order(rows: List[Dict[str, Any]], order: str) -> List[Dict[str, Any]]:
+    for part in reversed(order.split(',')):
+        column, *modifiers = part.split('.')
+        descending = 'desc' in modifiers
+        present = [row for row in rows if row.get(column) is not None]
+        missing = [row for row in rows if row.get(column) is None]
+        present.sort(key=lambda row: row[column], reverse=descending)
+        nulls_first = 'nullsfirst' in modifiers or (descending and 'nullslast' not in modifiers)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+class StubSupabase:
+    """In-process PostgREST stand-in serving a synthetic dataset.
+
+    Supports the subset the generator uses: column filters, order, limit,
+    offset, Range headers, column projection, embedded resources (including
+    per-embed order/limit params), or= filters, PATCH, the set_care_plan_pdfs
+    and stale_care_plan_ids functions and Storage object uploads (kept in
+    objects, keyed by bucket/path). Every request sleeps latency_ms first to
+    simulate the network.
+    """
+
+    def __init__(self, db: Dict[str, List[Dict[str, Any]]], latency_ms: float = 0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.db = db
+        self.latency_ms = latency_ms
+        self.requests = 0
+        self.objects: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._handle(self, 'GET')
+
+            def do_PATCH(self):
+                stub._handle(self, 'PATCH')
+
+            def do_POST(self):
+                stub._handle(self, 'POST')
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _stale_care_plan_ids(self) -> List[Dict[str, Any]]:
+        """Rows of the stale_care_plan_ids function: each child against its own plan."""
+        def stamp(row: Dict[str, Any], columns) -> Any:
+            stamps = [generator.parse_timestamp(row.get(column)) for column in columns]
+            return max((ts for ts in stamps if ts), default=None)
+
+        changed: Dict[str, List[Any]] = {}
+        for table, columns in generator.STALENESS_COLUMNS.items():
+            for row in self.db.get(table, []):
+                changed.setdefault(row.get('care_plan_id'), []).append(stamp(row, columns))
+        plan_by_med_rec = {rec['id']: rec.get('care_plan_id')
+                           for rec in self.db.get('rc_medication_reconciliations', [])}
+        for item in self.db.get('rc_medication_items', []):
+            changed.setdefault(plan_by_med_rec.get(item.get('med_rec_id')), []).append(
+                stamp(item, ('created_at',)))
+        stale = []
+        for plan in self.db.get('rc_care_plans', []):
+            generated = generator.parse_timestamp(plan.get('pdf_generated_at'))
+            if generated is None or any(ts and ts > generated for ts in changed.get(plan['id'], [])):
+                stale.append({'id': plan['id']})
+        return stale
+
+    def _select(self, table: str, params: List[Tuple[str, str]], prefix: str = '') -> List[Dict]:
+        """Apply filters, ordering, paging and projection for table (or an embed)."""
+        return self._select_rows(list(self.db.get(table, [])), params, table, prefix)
+
+    def _select_rows(self, rows: List[Dict], params: List[Tuple[str, str]], table: str = '',
+                     prefix: str = '') -> List[Dict]:
+        select, order, limit, offset = '*', None, None, 0
+        for key, value in params:
+            if prefix:
+                if not key.startswith(prefix):
+                    continue
+                key = key[len(prefix):]
+            elif '.' in key and key.split('.', 1)[0] in self.db:
+                continue  # Parameter for an embedded resource
+            if key == 'select':
+                select = value
+            elif key == 'order':
+                order = value
+            elif key == 'limit':
+                limit = int(value)
+            elif key == 'offset':
+                offset = int(value)
+            elif '.' not in key:
+                rows = [row for row in rows if _matches(row, key, value)]
+        if order:
+            rows = _order(rows, order)
+        rows = rows[offset:offset + limit if limit is not None else None]
+
+        columns, embeds = _parse_select(select)
+        result = []
+        for row in rows:
+            out = dict(row) if '*' in columns or not columns else {c: row.get(c) for c in columns}
+            for embed, embed_select in embeds:
+                out[embed] = self._embed(table, row, embed, embed_select, params, f"{prefix}{embed}.")
+            result.append(out)
+        return result
+
+    def _embed(self, table: str, row: Dict, embed: str, select: str,
+               params: List[Tuple[str, str]], prefix: str) -> Any:
+        if (table, embed) not in RELATIONSHIPS:
+            raise LookupError(f"Could not find a relationship between '{table}' and '{embed}'")
+        parent_column, child_column, many = RELATIONSHIPS[(table, embed)]
+        scoped = [(k, v) for k, v in params if k.startswith(prefix)]
+        scoped += [(f"{prefix}select", select), (f"{prefix}{child_column}", f"eq.{row.get(parent_column)}")]
+        children = self._select(embed, scoped, prefix)
+        return children if many else (children[0] if children else None)
+
+    def _handle_post(self, handler: BaseHTTPRequestHandler, path: str):
+        length = int(handler.headers.get('Content-Length') or 0)
+        body = handler.rfile.read(length)
+        storage_prefix = '/storage/v1/object/'
+        if path.startswith(storage_prefix):
+            key = path[len(storage_prefix):]
+            with self._lock:
+                if key in self.objects and handler.headers.get('x-upsert') != 'true':
+                    self._reply(handler, 409, {'error': 'Duplicate'})
+                    return
+                self.objects[key] = body
+            self._reply(handler, 200, {'Key': key})
+        elif path == '/rest/v1/rpc/set_care_plan_pdfs':
+            updates = {update['id']: update for update in json.loads(body or b'{}')['updates']}
+            changed = 0
+            for row in self.db.get('rc_care_plans', []):
+                update = updates.get(row.get('id'))
+                if update is not None:
+                    row['pdf_url'] = update.get('pdf_url') or row.get('pdf_url')
+                    row['pdf_generated_at'] = update['pdf_generated_at']
+                    changed += 1
+            self._reply(handler, 200, changed)
+        else:
+            self._reply(handler, 404, {'message': f'Could not find {path}'})
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        with self._lock:
+            self.requests += 1
+        parsed = urlparse(handler.path)
+        if method == 'POST':
+            self._handle_post(handler, unquote(parsed.path))
+            return
+        table = unquote(parsed.path.rsplit('/', 1)[-1])
+        params = parse_qsl(parsed.query, keep_blank_values=True)
+        if unquote(parsed.path) == '/rest/v1/rpc/stale_care_plan_ids':
+            self._reply(handler, 200, self._select_rows(self._stale_care_plan_ids(), params))
+            return
+        if table not in self.db:
+            self._reply(handler, 404, {'message': f'relation {table} does not exist'})
+            return
+
+        if method == 'PATCH':
+            length = int(handler.headers.get('Content-Length') or 0)
+            body = json.loads(handler.rfile.read(length) or b'{}')
+            filters = [(k, v) for k, v in params if k not in ('select', 'order', 'limit', 'offset')]
+            for row in self.db[table]:
+                if all(_matches(row, k, v) for k, v in filters):
+                    row.update(body)
+            self._reply(handler, 204, None)
+            return
+
+        try:
+            rows = self._select(table, params)
+        except LookupError as e:
+            # PostgREST answers unknown embeds with 400 / PGRST200
+            self._reply(handler, 400, {'code': 'PGRST200', 'message': str(e)})
+            return
+        except ValueError as e:
+            # ...and query strings it cannot parse with 400 / PGRST100
+            self._reply(handler, 400, {'code': 'PGRST100', 'message': str(e)})
+            return
+        headers = {}
+        range_header = handler.headers.get('Range')
+        if range_header:
+            first, _, last = range_header.partition('=')[-1].partition('-')
+            first = int(first or 0)
+            end = int(last) + 1 if last else len(rows)
+            total = len(rows)
+            rows = rows[first:end]
+            headers['Content-Range'] = f"{first}-{first + len(rows) - 1}/{total}" if rows else f"*/{total}"
+        self._reply(handler, 200, rows, headers)
+
+    def _reply(self, handler: BaseHTTPRequestHandler, status: int, payload: Any,
+               headers: Optional[Dict[str, str]] = None):
+        body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process and its reaped children, in MB."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # bytes on macOS, KB elsewhere
+    return max(own, children) / scale
+
+
+def run_scenario(plans: int, medications: int, findings_chars: int, latency_ms: float,
+                 workers: List[int], samples: int = 5) -> Dict[str, Any]:
+    """Benchmark one dataset shape; runs in a fresh process so peak RSS is its own."""
+    db = build_dataset(plans=plans, medications=medications, findings_chars=findings_chars)
+    care_plan_ids = [plan['id'] for plan in db['rc_care_plans']]
+    result: Dict[str, Any] = {
+        'plans': plans, 'medications': medications, 'findings_chars': findings_chars,
+        'latency_ms': latency_ms,
+    }
+
+    with StubSupabase(db, latency_ms=latency_ms) as stub:
+        generator.SUPABASE_URL = stub.url
+        generator.configure_http()
+
+        # Single renders: the on-demand path, one plan at a time
+        load_ms, layout_ms, pages, sizes, requests_per_plan = [], [], [], [], []
+        for care_plan_id in care_plan_ids[:samples]:
+            before = stub.requests
+            started = time.perf_counter()
+            pdf_generator = generator.CarePlanPDFGenerator(care_plan_id)
+            if not pdf_generator.load_data():
+                raise RuntimeError(f"stub could not serve {care_plan_id}")
+            load_ms.append((time.perf_counter() - started) * 1000)
+            requests_per_plan.append(stub.requests - before)
+            pdf = pdf_generator.render_bytes()
+            layout = pdf_generator.metrics.layout
+            layout_ms.append(layout['ms'])
+            pages.append(layout['pages'])
+            sizes.append(len(pdf))
+        result.update({
+            'fetch_ms_p50': round(statistics.median(load_ms), 1),
+            'requests_per_plan': max(requests_per_plan),
+            'layout_ms_p50': round(statistics.median(layout_ms), 1),
+            'pages': max(pages),
+            'pdf_kb': round(statistics.median(sizes) / 1024, 1),
+        })
+
+        # Batch renders: prefetch + render, per worker count
+        result['batch'] = []
+        for worker_count in workers:
+            before = stub.requests
+            with tempfile.TemporaryDirectory() as output_dir, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                outcome = generator.render_batch(care_plan_ids, output_dir, workers=worker_count)
+                elapsed = time.perf_counter() - started
+            if not all(outcome.values()):
+                raise RuntimeError(f"batch render failed with {worker_count} workers")
+            throughput = plans / elapsed
+            result['batch'].append({
+                'workers': worker_count,
+                'seconds': round(elapsed, 3),
+                'requests': stub.requests - before,
+                'plans_per_second': round(throughput, 2),
+                'plans_per_second_per_core': round(throughput / worker_count, 2),
+            })
+
+    result['peak_rss_mb'] = round(_peak_rss_mb(), 1)
+    return result
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(',') if part]
+
+
+def print_report(results: List[Dict[str, Any]]):
+    """Print a compact table of benchmark results."""
+    print(f"{'meds':>5} {'findings':>8} {'fetch ms':>9} {'reqs':>5} {'layout ms':>10} "
+          f"{'pages':>5} {'KB':>7} {'RSS MB':>7}  batch (workers: plans/s, per core, reqs)")
+    for r in results:
+        batch = '  '.join(
+            f"{b['workers']}: {b['plans_per_second']}, {b['plans_per_second_per_core']}, {b['requests']}"
+            for b in r['batch']
+        )
+        print(f"{r['medications']:>5} {r['findings_chars']:>8} {r['fetch_ms_p50']:>9} "
+              f"{r['requests_per_plan']:>5} {r['layout_ms_p50']:>10} {r['pages']:>5} "
+              f"{r['pdf_kb']:>7} {r['peak_rss_mb']:>7}  {batch}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the care plan PDF generator.")
+    parser.add_argument('--plans', type=int, default=20, help="Synthetic plans per scenario")
+    parser.add_argument('--medications', type=_int_list, default=[1, 200],
+                        help="Comma-separated medication counts per plan")
+    parser.add_argument('--findings-chars', type=_int_list, default=[200, 4000],
+                        help="Comma-separated 10-Vs findings lengths")
+    parser.add_argument('--latency-ms', type=float, default=20, help="Injected latency per request")
+    parser.add_argument('--workers', type=_int_list, default=[1, os.cpu_count() or 1],
+                        help="Comma-separated batch worker counts")
+    parser.add_argument('--samples', type=int, default=5, help="Single-plan renders to sample")
+    parser.add_argument('--json', help="Also write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for medications in args.medications:
+        for findings_chars in args.findings_chars:
+            # Fresh process per scenario so peak RSS is not carried over
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                results.append(pool.submit(
+                    run_scenario, args.plans, medications, findings_chars,
+                    args.latency_ms, args.workers, args.samples,
+                ).result())
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+-- Bulk write-back of generated PDF locations for rc_care_plans
+-- Used by the Python PDF generator to stamp many plans in one request:
+--   POST /rest/v1/rpc/set_care_plan_pdfs  {"updates": [{"id", "pdf_url", "pdf_generated_at"}, ...]}
+-- A null or missing pdf_url keeps the plan's current pdf_url.
+
+CREATE OR REPLACE FUNCTION public.set_care_plan_pdfs(updates jsonb)
+RETURNS integer AS $$
+  WITH changed AS (
+    UPDATE public.rc_care_plans p
+    SET
+      pdf_url = COALESCE(u.pdf_url, p.pdf_url),
+      pdf_generated_at = u.pdf_generated_at
+    FROM jsonb_to_recordset(updates) AS u(id uuid, pdf_url text, pdf_generated_at timestamptz)
+    WHERE p.id = u.id
+    RETURNING 1
+  )
+  SELECT count(*)::integer FROM changed;
+$$ LANGUAGE sql;
+
+GRANT EXECUTE ON FUNCTION public.set_care_plan_pdfs(jsonb) TO authenticated, service_role;
@@ -0,0 +1,56 @@
+-- Care plans whose generated PDF is missing or older than their source rows
+-- Used by the Python PDF generator's --stale mode:
+--   GET /rest/v1/rpc/stale_care_plan_ids?order=id&limit=500&offset=0
+-- Each dependent row is compared with its own plan's pdf_generated_at, so
+-- plans that never change do not widen the scan. Rows edited in place
+-- (4Ps and SDOH assessments are PATCHed with updated_at) count from their
+-- latest write. The plan row's own updated_at is not compared: writing
+-- pdf_generated_at back bumps it, and the columns the PDF shows are set
+-- when the plan is created.
+-- Keep in sync with STALENESS_COLUMNS in care_plan_pdf_generator.py.
+
+CREATE OR REPLACE FUNCTION public.stale_care_plan_ids()
+RETURNS TABLE (id uuid) AS $$
+  SELECT p.id
+  FROM public.rc_care_plans p
+  WHERE p.pdf_generated_at IS NULL
+    OR EXISTS (
+      SELECT 1 FROM public.rc_fourps_assessments c
+      WHERE c.care_plan_id = p.id
+        AND GREATEST(c.created_at, c.updated_at) > p.pdf_generated_at
+    )
+    OR EXISTS (
+      SELECT 1 FROM public.rc_sdoh_assessments c
+      WHERE c.care_plan_id = p.id
+        AND GREATEST(c.created_at, c.updated_at) > p.pdf_generated_at
+    )
+    OR EXISTS (
+      SELECT 1 FROM public.rc_overlay_selections c
+      WHERE c.care_plan_id = p.id AND c.created_at > p.pdf_generated_at
+    )
+    OR EXISTS (
+      SELECT 1 FROM public.rc_guideline_references c
+      WHERE c.care_plan_id = p.id AND c.created_at > p.pdf_generated_at
+    )
+    OR EXISTS (
+      SELECT 1 FROM public.rc_care_plan_vs c
+      WHERE c.care_plan_id = p.id AND c.created_at > p.pdf_generated_at
+    )
+    OR EXISTS (
+      SELECT 1 FROM public.rc_care_plan_attestations c
+      WHERE c.care_plan_id = p.id AND c.created_at > p.pdf_generated_at
+    )
+    OR EXISTS (
+      SELECT 1 FROM public.rc_medication_reconciliations r
+      WHERE r.care_plan_id = p.id
+        AND (
+          r.created_at > p.pdf_generated_at
+          OR EXISTS (
+            SELECT 1 FROM public.rc_medication_items i
+            WHERE i.med_rec_id = r.id AND i.created_at > p.pdf_generated_at
+          )
+        )
+    );
+$$ LANGUAGE sql STABLE;
+
+GRANT EXECUTE ON FUNCTION public.stale_care_plan_ids() TO anon, authenticated, service_role;
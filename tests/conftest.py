@@ -0,0 +1,32 @@
+"""Shared fixtures: the generator pointed at the benchmark's PostgREST stand-in."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import care_plan_pdf_benchmark as benchmark  # noqa: E402
+import care_plan_pdf_generator as generator  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    return benchmark.build_dataset(plans=6, medications=5, findings_chars=80)
+
+
+@pytest.fixture
+def stub(db, monkeypatch):
+    """Serve db from a StubSupabase and reset the generator's remembered state."""
+    with benchmark.StubSupabase(db) as server:
+        monkeypatch.setattr(generator, 'SUPABASE_URL', server.url)
+        monkeypatch.setattr(generator, '_embedding_supported', None)
+        monkeypatch.setattr(generator, '_stale_rpc_supported', None)
+        monkeypatch.setattr(generator, '_bulk_writeback_supported', None)
+        monkeypatch.setattr(generator, 'FETCH_STRATEGY', 'auto')
+        monkeypatch.setattr(generator, '_metrics_sinks', [])
+        generator.case_cache.clear()
+        generator.configure_http(max_retries=0)
+        yield server
+        generator.configure_http()
@@ -0,0 +1,34 @@
+"""Cohort analytics loading and chart colors."""
+
+import numpy as np
+import pytest
+
+import care_plan_pdf_benchmark as benchmark
+import care_plan_pdf_generator as generator
+
+
+@pytest.fixture
+def db():
+    # More plans than one fetch_in chunk, so a filtered load is split
+    return benchmark.build_dataset(plans=generator.BATCH_CHUNK_SIZE * 3 + 7, medications=1,
+                                   findings_chars=20)
+
+
+def test_filtered_load_matches_unfiltered(stub, db):
+    everything = generator.load_cohort()
+    requests_before = stub.requests
+    filtered = generator.load_cohort(since='2000-01-01')
+    # One plan listing plus four id chunks per assessment table
+    assert stub.requests - requests_before == 1 + 2 * 4
+    assert filtered.plan_ids == everything.plan_ids
+    np.testing.assert_array_equal(filtered.four_ps, everything.four_ps)
+    np.testing.assert_array_equal(filtered.sdoh, everything.sdoh)
+    np.testing.assert_array_equal(filtered.flags, everything.flags)
+
+
+def test_series_colors_follow_care_plan_type_labels():
+    for position, plan_type in enumerate(generator.CARE_PLAN_TYPE_LABELS):
+        assert generator._series_color(plan_type) == generator.COHORT_SERIES_COLORS[position]
+    assert generator._series_color('not_a_type') == generator.COHORT_OTHER_COLOR
+    assert sorted(['discharge', '', 'initial'], key=generator._plan_type_order) == \
+        ['initial', 'discharge', '']
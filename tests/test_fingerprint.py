@@ -0,0 +1,119 @@
+"""Plan fingerprints, the PDF cache and plan diffs."""
+
+import os
+
+import care_plan_pdf_generator as generator
+
+PLAN_IDS = ['plan-000001', 'plan-000004']
+
+
+def _loaded(care_plan_id, strategy, monkeypatch):
+    monkeypatch.setattr(generator, 'FETCH_STRATEGY', strategy)
+    generator.case_cache.clear()
+    pdf_generator = generator.CarePlanPDFGenerator(care_plan_id)
+    assert pdf_generator.load_data()
+    return pdf_generator.plan_data()
+
+
+def _prefetched(strategy, monkeypatch):
+    monkeypatch.setattr(generator, 'FETCH_STRATEGY', strategy)
+    generator.case_cache.clear()
+    return generator.prefetch_care_plans(PLAN_IDS)
+
+
+def test_every_load_path_fingerprints_alike(stub, monkeypatch, tmp_path):
+    snapshot_path = str(tmp_path / 'plans.sqlite')
+    assert generator.dump_snapshot(PLAN_IDS, snapshot_path) == len(PLAN_IDS)
+    prefetched = {
+        'embedded batch': _prefetched('embedded', monkeypatch),
+        'per-table batch': _prefetched('per-table', monkeypatch),
+    }
+    with generator.SnapshotStore(snapshot_path, readonly=True) as store:
+        prefetched['snapshot'] = store.get_many(PLAN_IDS)
+    
+    for care_plan_id in PLAN_IDS:
+        fingerprints = {
+            'embedded': generator.fingerprint_plan_data(_loaded(care_plan_id, 'embedded', monkeypatch)),
+            'per-table': generator.fingerprint_plan_data(_loaded(care_plan_id, 'per-table', monkeypatch)),
+        }
+        for path, plans in prefetched.items():
+            fingerprints[path] = generator.fingerprint_plan_data(plans[care_plan_id])
+        assert len(set(fingerprints.values())) == 1, fingerprints
+    assert generator._embedding_supported is True
+
+
+def test_fingerprint_ignores_write_back_columns_only(stub, monkeypatch):
+    data = _loaded(PLAN_IDS[0], 'auto', monkeypatch)
+    key = generator.fingerprint_plan_data(data)
+    row = data['care_plan'].to_row()
+    
+    stamped = dict(data, care_plan=generator.CarePlanRecord.from_row(
+        dict(row, pdf_url='https://example.test/a.pdf', pdf_generated_at='2026-01-01T00:00:00+00:00')
+    ))
+    assert generator.fingerprint_plan_data(stamped) == key
+    
+    edited = dict(data, medications=data['medications'][1:])
+    assert generator.fingerprint_plan_data(edited) != key
+
+
+def test_cached_render_skips_layout(stub, db, tmp_path):
+    cache = generator.PDFCache(str(tmp_path / 'cache'))
+    first = generator.CarePlanPDFGenerator(PLAN_IDS[0])
+    pdf, from_cache = first._render(cache)
+    assert pdf and not from_cache
+    
+    second = generator.CarePlanPDFGenerator(PLAN_IDS[0])
+    cached_pdf, from_cache = second._render(cache)
+    assert from_cache and cached_pdf == pdf
+    assert not second.metrics.layout
+    
+    # An edited row changes the fingerprint, so the plan is laid out again
+    next(item for item in db['rc_medication_items']
+         if item['med_rec_id'] == 'medrec-000001')['dosage'] = '20 mg'
+    generator.case_cache.clear()
+    third = generator.CarePlanPDFGenerator(PLAN_IDS[0])
+    _, from_cache = third._render(cache)
+    assert not from_cache
+
+
+def test_pdf_cache_evicts_least_recently_used(tmp_path):
+    cache = generator.PDFCache(str(tmp_path), max_bytes=250)
+    cache.put('a', b'a' * 100)
+    cache.put('b', b'b' * 100)
+    # Age both entries explicitly (file mtimes are too coarse for back-to-back writes)
+    os.utime(tmp_path / 'a.pdf', (1, 1))
+    os.utime(tmp_path / 'b.pdf', (2, 2))
+    assert cache.get('a') == b'a' * 100  # a is now the most recently used
+    cache.put('c', b'c' * 100)
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+
+
+def test_diff_plans_reports_section_changes(stub, monkeypatch):
+    previous = _loaded(PLAN_IDS[0], 'auto', monkeypatch)
+    medications = [item.to_row() for item in previous['medications']]
+    medications[0]['dosage'] = '75 mcg'
+    removed = medications.pop(1)
+    medications.append(dict(medications[-1], id='med-new', medication_name='Medication New'))
+    four_ps = previous['four_ps'].to_row()
+    four_ps['p1_physical'] += 1
+    current = generator.plan_records(dict(previous, medications=medications, four_ps=four_ps))
+    
+    diff = generator.diff_plans(previous, current)
+    
+    assert diff['four_ps'] == {'status': 'changed', 'columns': ['p1_physical']}
+    assert diff['sdoh']['status'] == 'unchanged'
+    change = diff['medications']
+    assert change['status'] == 'changed'
+    assert [item.medication_name for item in change['added']] == ['Medication New']
+    assert [item.medication_name for item in change['changed']] == [medications[0]['medication_name']]
+    assert [item.medication_name for item in change['removed']] == [removed['medication_name']]
+    assert generator.diff_plans(previous, previous)['medications']['status'] == 'unchanged'
+
+
+def test_diff_plans_new_and_removed_rows(stub, monkeypatch):
+    previous = _loaded(PLAN_IDS[0], 'auto', monkeypatch)
+    diff = generator.diff_plans(dict(previous, attestation=None), dict(previous, sdoh=None))
+    assert previous['attestation'] is not None
+    assert diff['attestation']['status'] == 'new'
+    assert diff['sdoh']['status'] == 'removed'
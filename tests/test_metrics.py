@@ -0,0 +1,59 @@
+"""Prometheus exposition of render metrics."""
+
+import threading
+
+import care_plan_pdf_generator as generator
+
+
+def _metrics(cached=False):
+    metrics = generator.RenderMetrics('plan-000001')
+    metrics.cached = cached
+    metrics.total_ms = 250.0
+    metrics.record_fetch('plan', 'care_plans?id=eq.plan-000001', 200, 512, 12.0)
+    metrics.layout = {'ms': 100.0, 'pages': 3, 'bytes': 4096}
+    return metrics
+
+
+def test_every_summary_sum_has_a_count():
+    sink = generator.PrometheusSink()
+    sink(_metrics())
+    sink(_metrics(cached=True))
+    samples = [line.split(' ')[0] for line in sink.render().splitlines()
+               if not line.startswith('#')]
+    for sample in samples:
+        if '_sum' in sample:
+            assert sample.replace('_sum', '_count') in samples
+    assert 'care_plan_pdf_render_seconds_count{cached="false"}' in samples
+
+
+def test_families_have_help_and_type_once():
+    sink = generator.PrometheusSink()
+    sink(_metrics())
+    text = sink.render({'care_plan_pdf_case_cache_hits_total': 4})
+    lines = text.splitlines()
+    assert lines.count('# TYPE care_plan_pdf_render_seconds summary') == 1
+    assert lines.count('# TYPE care_plan_pdf_renders_total counter') == 1
+    assert '# TYPE care_plan_pdf_case_cache_hits_total counter' in lines
+    assert 'care_plan_pdf_case_cache_hits_total 4' in lines
+    for line in lines:
+        if line.startswith('# TYPE '):
+            family = line.split(' ')[2]
+            assert f'# HELP {family} ' in text
+
+
+def test_render_while_recording():
+    sink = generator.PrometheusSink()
+    stop = threading.Event()
+
+    def record():
+        while not stop.is_set():
+            sink(_metrics())
+
+    writer = threading.Thread(target=record)
+    writer.start()
+    try:
+        for _ in range(200):
+            sink.render()
+    finally:
+        stop.set()
+        writer.join()
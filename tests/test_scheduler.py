@@ -0,0 +1,58 @@
+"""RenderScheduler single-flight and admission."""
+
+import threading
+
+import pytest
+
+import care_plan_pdf_generator as generator
+
+
+@pytest.fixture
+def blocked_renders(monkeypatch):
+    """Make renders wait for release; returns (release event, rendered ids)."""
+    release = threading.Event()
+    rendered = []
+
+    def render_bytes(self, cache=None):
+        rendered.append(self.care_plan_id)
+        release.wait(5)
+        return f"%PDF {self.care_plan_id}".encode()
+
+    monkeypatch.setattr(generator.CarePlanPDFGenerator, 'render_bytes', render_bytes)
+    yield release, rendered
+    release.set()
+
+
+def test_concurrent_requests_join_one_render(blocked_renders):
+    release, rendered = blocked_renders
+    scheduler = generator.RenderScheduler(interactive_workers=2, bulk_workers=1)
+    try:
+        futures = [scheduler.submit('plan-000001') for _ in range(5)]
+        futures.append(scheduler.submit('plan-000001', 'bulk'))
+        release.set()
+        results = {future.result(5) for future in futures}
+    finally:
+        scheduler.shutdown()
+    assert results == {b'%PDF plan-000001'}
+    assert rendered == ['plan-000001']
+    assert scheduler.jobs_started == 1
+    assert scheduler.jobs_joined == 5
+
+
+def test_full_queue_rejects_new_plans_but_admits_joins(blocked_renders):
+    release, rendered = blocked_renders
+    scheduler = generator.RenderScheduler(interactive_workers=1, bulk_workers=1, max_jobs=2)
+    try:
+        first = scheduler.submit('plan-000001')
+        second = scheduler.submit('plan-000002')
+        with pytest.raises(generator.RenderQueueFull):
+            scheduler.submit('plan-000003')
+        joined = scheduler.submit('plan-000002')
+        release.set()
+        assert first.result(5) == b'%PDF plan-000001'
+        assert joined is second and joined.result(5) == b'%PDF plan-000002'
+        # Finished jobs free their slots
+        assert scheduler.render('plan-000003', timeout=5) == b'%PDF plan-000003'
+    finally:
+        scheduler.shutdown()
+    assert 'plan-000003' in rendered
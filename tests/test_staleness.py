@@ -0,0 +1,35 @@
+import care_plan_pdf_generator as generator
+
+GENERATED_AT = '2026-01-01T02:00:00.250000+02:00'
+
+
+def _stamp_all(db, generated_at=GENERATED_AT):
+    for plan in db['rc_care_plans']:
+        plan['pdf_generated_at'] = generated_at
+        # An updated_at trigger bumps the plan row when pdf_generated_at is written
+        plan['updated_at'] = '2026-01-01T00:00:05+00:00'
+
+
+def test_unrendered_plans_are_stale(stub, db):
+    assert generator.find_stale_care_plan_ids() == [plan['id'] for plan in db['rc_care_plans']]
+
+
+def test_stamped_plans_are_not_stale(stub, db):
+    _stamp_all(db)
+    assert generator.find_stale_care_plan_ids() == []
+
+
+def test_server_side_function_detects_in_place_edits(stub, db):
+    _stamp_all(db)
+    db['rc_fourps_assessments'][1]['updated_at'] = '2026-01-01T00:00:00.500000+00:00'
+    db['rc_medication_items'][-1]['created_at'] = '2026-02-01T00:00:00+00:00'
+    assert generator.find_stale_care_plan_ids() == ['plan-000001', 'plan-000005']
+    assert generator._stale_rpc_supported is True
+
+
+def test_client_side_fallback_with_fractional_offset_timestamps(stub, db):
+    _stamp_all(db)
+    # 0.25s after the stamp, and 0.15s before it (the stamp is 00:00:00.25 UTC)
+    db['rc_fourps_assessments'][1]['updated_at'] = '2026-01-01T00:00:00.500000+00:00'
+    db['rc_sdoh_assessments'][3]['updated_at'] = '2026-01-01T00:00:00.100000+00:00'
+    assert generator._find_stale_client_side() == ['plan-000001']
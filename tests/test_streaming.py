@@ -0,0 +1,45 @@
+"""Streamed list sections are laid out one chunk at a time."""
+
+import pytest
+
+import care_plan_pdf_benchmark as benchmark
+import care_plan_pdf_generator as generator
+
+
+@pytest.fixture
+def db():
+    return benchmark.build_dataset(plans=1, medications=300, findings_chars=80)
+
+
+def _plan_id(db):
+    return db['rc_care_plans'][0]['id']
+
+
+def test_streamed_render_matches_loaded_render(stub, db):
+    loaded = generator.CarePlanPDFGenerator(_plan_id(db))
+    streamed = generator.CarePlanPDFGenerator(_plan_id(db), stream_lists=True)
+    assert loaded.render_bytes() and streamed.render_bytes()
+    assert streamed.metrics.layout['pages'] == loaded.metrics.layout['pages']
+
+
+def test_medication_chunks_are_built_as_layout_reaches_them(stub, db):
+    pdf_generator = generator.CarePlanPDFGenerator(_plan_id(db), stream_lists=True)
+    assert pdf_generator.load_data()
+    medications, read = pdf_generator.medications, []
+
+    def rows():
+        for row in medications:
+            read.append(row)
+            yield row
+
+    pdf_generator.medications = rows()
+    pdf_generator._build_medications_section()
+    # Only the row _peek looked at; the rest are read during layout
+    assert len(read) == 1
+    assert pdf_generator.render_bytes()
+    assert len(read) == 300
+
+
+def test_changes_only_cannot_stream():
+    with pytest.raises(ValueError):
+        generator.CarePlanPDFGenerator('plan-000001', stream_lists=True, changes_only=True)